@@ -1,14 +1,172 @@
 """API Client for Home.InfoPoint."""
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import html
 import logging
+import re
+from collections.abc import Mapping
+from types import MappingProxyType
+
 import aiohttp
 from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 
 from .const import DEFAULT_URL
 
 _LOGGER = logging.getLogger(__name__)
 
+# Requests go through HA's shared session, keep its pooled connection alive
+_HEADERS: Mapping[str, str] = MappingProxyType({
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Connection": "keep-alive",
+    "Accept-Encoding": "gzip, deflate",
+})
+
+# How much of the page to look at for a <meta charset>
+_ENCODING_SNIFF_SIZE = 16384
+
+# Error messages on the page after a failed login
+_LOGIN_ERROR_RE = re.compile(r"fehler|falsch|nicht erfolgreich", re.IGNORECASE)
+
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_FORM_RE = re.compile(r"<form\b([^>]*)>(.*?)</form>", re.IGNORECASE | re.DOTALL)
+_INPUT_RE = re.compile(r"<input\b([^>]*)>", re.IGNORECASE)
+_ATTR_RE = re.compile(r"""([\w-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+
+# Row label in the absences table -> key in data["absences"]
+_ABSENCE_ROWS = {
+    "Fehltage": "days",
+    "Unentschuldigte Fehltage": "unexcused_days",
+    "Fehlstunden": "hours",
+    "Unentschuldigte Fehlstunden": "unexcused_hours",
+}
+
+# Tables with both a 'Zensur' and a 'Datum' header hold the grades of a subject
+_GRADE_TABLES_XPATH = etree.XPath(
+    '//table[.//th[normalize-space()="Zensur"] and .//th[normalize-space()="Datum"]]'
+)
+# Closest heading before a grade table, skipping noise (Legends, etc.)
+_SUBJECT_XPATH = etree.XPath(
+    "preceding::*[self::h3 or self::b or self::strong]"
+    "[string-length(normalize-space()) > 2"
+    ' and not(contains(., "Notenspiegel"))'
+    ' and not(contains(., "Endnoten"))'
+    ' and not(contains(., "Legende"))][1]'
+)
+
+
+def _has_logout(text: str) -> bool:
+    """Return True if the page shows the logout button (we are logged in)."""
+    return "Abmelden" in text or "Logout" in text
+
+
+def _body_has_logout(body: bytes) -> bool:
+    """Same as _has_logout, on the raw (ASCII compatible) page bytes."""
+    return b"Abmelden" in body or b"Logout" in body
+
+
+def _cell_text(el) -> str:
+    """Return the text of an element, each text node stripped (like get_text(strip=True))."""
+    return "".join(t.strip() for t in el.itertext())
+
+
+def _guess_encoding(charset: str | None, head: bytes) -> str | None:
+    """Return the encoding to parse with, None lets lxml honour a <meta charset>."""
+    if charset:
+        return charset
+    if b"charset" in head.lower():
+        return None
+    # Same default response.text() falls back to for HTML
+    return "utf-8"
+
+
+def _parse_getdata(body: bytes, charset: str | None) -> dict:
+    """Parse the getdata.php page into the data dict."""
+    data = {}
+
+    parser = lxml.html.HTMLParser(encoding=_guess_encoding(charset, body[:_ENCODING_SNIFF_SIZE]))
+    tree = lxml.html.document_fromstring(body, parser=parser)
+    
+    page_text = tree.text_content()
+    
+    # 1. Parse Last Update
+    if "aktualisiert am" in page_text:
+        try:
+            part = page_text.split("aktualisiert am")[1].strip().split()[0]
+            part = part.strip('"').strip("'").split("<")[0]
+            data["last_update"] = part
+        except IndexError:
+            data["last_update"] = "Unknown"
+    else:
+         data["last_update"] = "Connected"
+
+    # 2. Parse Absences (Heuristic: Look for table with 'Fehltage')
+    data["absences"] = {
+        "days": 0,
+        "unexcused_days": 0,
+        "hours": "0",
+        "unexcused_hours": "0"
+    }
+    # Jump straight to the table holding the "Fehltage" row
+    tables = tree.xpath('//td[normalize-space()="Fehltage"]/ancestor::table[1]')
+    if tables:
+        found = set()
+        for row in tables[0].iter("tr"):
+            # Only direct cells, the absences table holds plain numbers
+            cols = [_cell_text(td) for td in row.iterchildren("td")]
+            if len(cols) < 2:
+                continue
+            key = _ABSENCE_ROWS.get(cols[0])
+            if key is None:
+                continue
+            if key in ("days", "unexcused_days"):
+                data["absences"][key] = int(cols[1])
+            else:
+                data["absences"][key] = cols[1]
+            found.add(key)
+            # Stop as soon as all four rows are in
+            if len(found) == len(_ABSENCE_ROWS):
+                break
+
+    # 3. Parse Grades
+    # Logic: Only take real grade tables (with 'Zensur' and 'Datum' headers)
+    # and attribute each to the closest heading (h3, b, strong) before it.
+    data["grades"] = []
+
+    for table in _GRADE_TABLES_XPATH(tree):
+        subjects = _SUBJECT_XPATH(table)
+        if not subjects:
+            continue
+        subject = _cell_text(subjects[0])
+
+        for row in table.iter("tr"):
+            cols = [_cell_text(td) for td in row.iter("td")]
+            if len(cols) >= 3:
+                # Found a grade!
+                # Format: Datum, Zensur, Bemerkung, ...
+                grade_val = cols[1]
+                if grade_val: # Only if grade exists
+                    data["grades"].append({
+                        "subject": subject,
+                        "date": cols[0],
+                        "grade": grade_val,
+                        "comment": cols[2]
+                    })
+
+    return data
+
+
+def _parse_attrs(raw: str) -> dict[str, str]:
+    """Parse the attributes of a single tag into a dict."""
+    return {
+        m.group(1).lower(): html.unescape(m.group(2) or m.group(3) or m.group(4) or "")
+        for m in _ATTR_RE.finditer(raw)
+    }
+
+
 class HomeInfoPointClient:
     """Home.InfoPoint API Client."""
 
@@ -21,210 +179,231 @@ class HomeInfoPointClient:
         if not self._url.endswith("/"):
              self._url += "/"
 
+        # Build the URLs once, every refresh reuses them
+        self._start_url = f"{self._url}default.php"
+        self._getdata_url = f"{self._url}getdata.php"
+
+        # Login form template (action URL, (name, role, value) fields) from the
+        # last successful login, credentials are filled in on every submit
+        self._login_form: tuple[str, tuple[tuple[str, str, str], ...]] | None = None
+
+        # Cache validators and the last parsed getdata.php result
+        self._last_etag: str | None = None
+        self._last_modified: str | None = None
+        self._last_body_hash: bytes | None = None
+        self._cached_data: dict | None = None
+
     async def authenticate(self) -> bool:
         """Authenticate with the Home.InfoPoint service."""
+        if self._login_form is not None:
+            # Re-use the form template from the last successful login
+            post_url, fields = self._login_form
+            if await self._submit_login(post_url, self._login_data(fields), cached=True):
+                return True
+            _LOGGER.debug("Cached login form was rejected, fetching a fresh one")
+            self._login_form = None
+
+        login_form = await self._fetch_login_form()
+        if login_form is None:
+            return False
+
+        post_url, fields = login_form
+        if not await self._submit_login(post_url, self._login_data(fields)):
+            return False
+
+        # Hidden inputs may carry per-session tokens, such forms are fetched fresh every time
+        if all(role != "hidden" for _, role, _ in fields):
+            self._login_form = login_form
+        return True
+
+    def _login_data(self, fields: tuple[tuple[str, str, str], ...]) -> dict:
+        """Fill in the credentials for the (name, role, value) fields of a login form."""
+        data = {}
+        for name, role, value in fields:
+            if role == "username":
+                data[name] = self._username
+            elif role == "password":
+                data[name] = self._password
+            else:
+                data[name] = value
+        return data
+
+    async def _fetch_login_form(self) -> tuple[str, tuple[tuple[str, str, str], ...]] | None:
+        """Fetch the login page and return the form action URL and its (name, role, value) fields."""
         # 1. Fetch the login page to parse the form
-        start_url = f"{self._url}default.php"
+        start_url = self._start_url
         _LOGGER.debug(f"Fetching login page: {start_url}")
-        
-        headers = self._get_headers()
 
-        async with self._session.get(start_url, headers=headers) as response:
+        async with self._session.get(start_url, headers=self._get_headers()) as response:
             text = await response.text()
-            soup = BeautifulSoup(text, "html.parser")
-            
-            # Find the login form
+
+        # Scrape the form with plain regexes, it only has a handful of inputs.
+        # Drop HTML comments first so commented-out forms are not picked up.
+        form_match = _FORM_RE.search(_COMMENT_RE.sub("", text))
+        if form_match:
+            form_attrs = _parse_attrs(form_match.group(1))
+            inputs = [_parse_attrs(m.group(1)) for m in _INPUT_RE.finditer(form_match.group(2))]
+        else:
+            # Fall back to a full parse for unusual markup
+            soup = BeautifulSoup(text, "lxml")
             form = soup.find("form")
             if not form:
                 _LOGGER.error("Could not find login form on page")
-                return False
+                return None
+            form_attrs = form.attrs
+            inputs = [input_tag.attrs for input_tag in form.find_all("input")]
+        
+        # Determine action URL
+        action = form_attrs.get("action")
+        if not action:
+            # Submit to self if no action
+            post_url = start_url
+        elif action.startswith("http"):
+            post_url = action
+        else:
+            post_url = f"{self._url}{action}"
+        
+        _LOGGER.debug(f"Found form, submitting to: {post_url}")
+
+        # Prepare form fields, credentials are filled in by _login_data
+        fields = {}
+        for attrs in inputs:
+            name = attrs.get("name")
+            input_type = attrs.get("type", "").lower()
+            if not name:
+                continue
             
-            # Determine action URL
-            action = form.get("action")
-            if not action:
-                # Submit to self if no action
-                post_url = start_url
-            elif action.startswith("http"):
-                post_url = action
-            else:
-                post_url = f"{self._url}{action}"
+            value = attrs.get("value", "")
             
-            _LOGGER.debug(f"Found form, submitting to: {post_url}")
-
-            # Prepare form data
-            data = {}
-            for input_tag in form.find_all("input"):
-                name = input_tag.get("name")
-                input_type = input_tag.get("type", "").lower()
-                if not name:
-                    continue
-                
-                value = input_tag.get("value", "")
-                
-                # If it's the submit button, keep original value
-                if input_type == "submit":
-                    data[name] = value
-                    continue
-                
-                if ("user" in name.lower() or "login" in name.lower()) and "pass" not in name.lower():
-                    data[name] = self._username
-                elif "pass" in name.lower():
-                     data[name] = self._password
-                else:
-                    data[name] = value
-
-            # Ensure we have at least the basics if heuristics failed (fallback)
-            if "username" not in data and "user" not in data:
-                 data["username"] = self._username
-            if "password" not in data:
-                 data["password"] = self._password
-            if "login" not in data: 
-                 data["login"] = "Anmelden"
+            # If it's the submit button, keep original value
+            if input_type == "submit":
+                fields[name] = ("submit", value)
+                continue
+            
+            if ("user" in name.lower() or "login" in name.lower()) and "pass" not in name.lower():
+                fields[name] = ("username", "")
+            elif "pass" in name.lower():
+                 fields[name] = ("password", "")
+            else:
+                fields[name] = ("hidden", value)
 
+        # Ensure we have at least the basics if heuristics failed (fallback)
+        if "username" not in fields and "user" not in fields:
+             fields["username"] = ("username", "")
+        if "password" not in fields:
+             fields["password"] = ("password", "")
+        if "login" not in fields: 
+             fields["login"] = ("submit", "Anmelden")
+
+        return post_url, tuple((name, role, value) for name, (role, value) in fields.items())
+
+    async def _submit_login(self, post_url: str, data: dict, cached: bool = False) -> bool:
+        """Submit the login form.
+
+        Failures with a cached form are expected (the form may have changed)
+        and only logged at debug level, the caller retries with a fresh form.
+        """
+        log_failure = _LOGGER.debug if cached else _LOGGER.error
+        # Add Referer (on a copy, the shared headers stay untouched)
+        headers = {**self._get_headers(), "Referer": self._start_url}
+        
+        _LOGGER.debug(f"Submitting login data (keys): {list(data.keys())}")
+        
+        async with self._session.post(post_url, data=data, headers=headers) as post_response:
+            post_text = await post_response.text()
             
-            # Add Referer
-            headers["Referer"] = start_url
+            # Plain substring test first, the page is never parsed for this
+            if _has_logout(post_text):
+                _LOGGER.info("Login successful (detected Logout button)")
+                return True
             
-            _LOGGER.debug(f"Submitting login data (keys): {list(data.keys())}")
+            # Check for explicit errors
+            if _LOGIN_ERROR_RE.search(post_text):
+                 log_failure("Login failed: Server returned error message")
+                 return False
             
-            async with self._session.post(post_url, data=data, headers=headers) as post_response:
-                post_text = await post_response.text()
-                
-                if "Abmelden" in post_text or "Logout" in post_text:
-                    _LOGGER.info("Login successful (detected Logout button)")
-                    return True
-                
-                # Check for explicit errors
-                lower_text = post_text.lower()
-                if "fehler" in lower_text or "falsch" in lower_text or "nicht erfolgreich" in lower_text:
-                     _LOGGER.error("Login failed: Server returned error message")
-                     return False
-                
-                # Check for error in URL (e.g. default.php?err=user)
-                if "err=" in str(post_response.url) or "error=" in str(post_response.url):
-                    _LOGGER.error(f"Login failed: Redirected to error URL {post_response.url}")
-                    return False
-                
-                # Double check with a follow-up request to default.php content
-                return await self._check_logged_in()
+            # Check for error in URL (e.g. default.php?err=user)
+            query = post_response.url.query
+            if "err" in query or "error" in query:
+                log_failure("Login failed: Redirected to error URL %s", post_response.url)
+                return False
+            
+            # Double check with a follow-up request to default.php content
+            return await self._check_logged_in()
 
     async def _check_logged_in(self) -> bool:
         """Check if we are effectively logged in."""
-        async with self._session.get(f"{self._url}default.php", headers=self._get_headers()) as response:
+        async with self._session.get(self._start_url, headers=self._get_headers()) as response:
              text = await response.text()
              # STRICT CHECK: Only "Abmelden" implies we are logged in.
-             is_logged_in = "Abmelden" in text or "Logout" in text
+             is_logged_in = _has_logout(text)
              _LOGGER.debug(f"Check login status: {is_logged_in}")
              return is_logged_in
 
-    def _get_headers(self) -> dict:
+    def _get_headers(self) -> Mapping[str, str]:
         """Return headers with User-Agent."""
-        return {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
+        return _HEADERS
+
+    async def _fetch_getdata(self, check_login: bool = True) -> dict | None:
+        """Fetch and parse getdata.php, re-using the last result if it did not change.
+
+        Returns None if check_login is set and the page shows we are logged out.
+        """
+        headers = self._get_headers()
+        if self._cached_data is not None and (self._last_etag or self._last_modified):
+            headers = {**headers}
+            if self._last_etag:
+                headers["If-None-Match"] = self._last_etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+
+        async with self._session.get(
+            self._getdata_url, headers=headers, raise_for_status=True
+        ) as response:
+            if response.status == 304 and self._cached_data is not None:
+                _LOGGER.debug("getdata.php not modified, using cached data")
+                return self._cached_data
+            # Keep the (already decompressed) bytes, the hash check below
+            # has to happen before parsing
+            body = await response.read()
+            charset = response.charset
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+
+        # The page has the logout button as long as the session is valid
+        if check_login and not _body_has_logout(body):
+            return None
+
+        # Servers that ignore the validators still send the same page
+        body_hash = hashlib.blake2b(body, digest_size=16).digest()
+        if body_hash == self._last_body_hash and self._cached_data is not None:
+            _LOGGER.debug("getdata.php unchanged, using cached data")
+            return self._cached_data
+
+        # Parsing is CPU bound, keep it off the event loop
+        data = await asyncio.get_running_loop().run_in_executor(
+            None, _parse_getdata, body, charset
+        )
+
+        self._last_etag = etag
+        self._last_modified = last_modified
+        self._last_body_hash = body_hash
+        self._cached_data = data
+        return data
 
     async def get_data(self) -> dict:
         """Fetch data from Home.InfoPoint."""
-        if not await self._check_logged_in():
+        # Fetch getdata.php right away, it also tells us if the session is still valid
+        try:
+            data = await self._fetch_getdata()
+        except aiohttp.ClientResponseError as err:
+            _LOGGER.debug(f"Fetching getdata.php failed ({err.status}), re-authenticating")
+            data = None
+
+        if data is None:
+            # Session expired, log in again and retry once
             if not await self.authenticate():
                 raise Exception("Authentication failed")
-
-        data = {}
-        
-        # Always fetch getdata.php as it contains the real data
-        async with self._session.get(f"{self._url}getdata.php", headers=self._get_headers()) as response:
-            text = await response.text()
-            soup = BeautifulSoup(text, "html.parser")
-            
-            page_text = soup.get_text()
-            
-            # 1. Parse Last Update
-            if "aktualisiert am" in page_text:
-                try:
-                    part = page_text.split("aktualisiert am")[1].strip().split()[0]
-                    part = part.strip('"').strip("'").split("<")[0]
-                    data["last_update"] = part
-                except IndexError:
-                    data["last_update"] = "Unknown"
-            else:
-                 data["last_update"] = "Connected"
-
-            # 2. Parse Absences (Heuristic: Look for table with 'Fehltage')
-            data["absences"] = {
-                "days": 0,
-                "unexcused_days": 0,
-                "hours": "0",
-                "unexcused_hours": "0"
-            }
-            tables = soup.find_all("table")
-            for table in tables:
-                rows = table.find_all("tr")
-                # fast check raw text
-                table_text = table.get_text()
-                if "Fehltage" in table_text and "Unentschuldigte" in table_text:
-                    for row in rows:
-                        cols = [td.get_text(strip=True) for td in row.find_all("td")]
-                        if not cols: continue
-                        if "Fehltage" == cols[0] and len(cols) > 1:
-                            data["absences"]["days"] = int(cols[1])
-                        elif "Unentschuldigte Fehltage" == cols[0] and len(cols) > 1:
-                            data["absences"]["unexcused_days"] = int(cols[1])
-                        elif "Fehlstunden" == cols[0] and len(cols) > 1:
-                            data["absences"]["hours"] = cols[1]
-                        elif "Unentschuldigte Fehlstunden" == cols[0] and len(cols) > 1:
-                            data["absences"]["unexcused_hours"] = cols[1]
-
-            # 3. Parse Grades
-            # Logic: Iterate over headers (h3, b, etc.) and find the next table
-            data["grades"] = []
-            
-            # We look for all 'b' tags or div headers that might be subjects. 
-            # In the debug dump, it identified them.
-            # A robust way is to iterate over all elements and maintain "current subject" state
-            
-            current_subject = None
-            
-            # Find all relevant elements in order
-            elements = soup.find_all(['h3', 'b', 'strong', 'table'])
-            
-            for el in elements:
-                if el.name in ['h3', 'b', 'strong']:
-                    text = el.get_text(strip=True)
-                    # Filter out noise (Legends, etc.)
-                    if len(text) > 2 and "Notenspiegel" not in text and "Endnoten" not in text and "Legende" not in text:
-                        current_subject = text
-                
-                elif el.name == 'table':
-                    if not current_subject:
-                        continue
-                        
-                    # Check if it's a grades table (has 'Zensur' or 'Note' header)
-                    headers = [th.get_text(strip=True) for th in el.find_all("th")]
-                    if 'Zensur' in headers and 'Datum' in headers:
-                        # Process Grades Table
-                        rows = el.find_all("tr")
-                        for row in rows:
-                            cols = [td.get_text(strip=True) for td in row.find_all("td")]
-                            if len(cols) >= 3:
-                                # Found a grade!
-                                # Format: Datum, Zensur, Bemerkung, ...
-                                try:
-                                    grade_val = cols[1]
-                                    if grade_val: # Only if grade exists
-                                        data["grades"].append({
-                                            "subject": current_subject,
-                                            "date": cols[0],
-                                            "grade": grade_val,
-                                            "comment": cols[2] if len(cols) > 2 else ""
-                                        })
-                                except:
-                                    pass
-                        
-                        # Reset subject so we don't attribute the next table (Endnoten) to this subject 
-                        # as "New Grades" (unless we want to). 
-                        # Actually, keeping current_subject is fine if we want Endnoten too, 
-                        # but usually headers separate them.
-                        # For now, let's just assume one grade table per header.
-                        # current_subject = None # Commented out to potentially capture multiple tables if needed
+            data = await self._fetch_getdata(check_login=False)
 
         return data
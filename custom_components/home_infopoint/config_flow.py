@@ -7,12 +7,28 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import aiohttp_client
 
-from .const import DOMAIN, DEFAULT_URL, CONF_URL, CONF_USERNAME, CONF_PASSWORD
+from .const import (
+    DOMAIN,
+    DEFAULT_URL,
+    CONF_URL,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    CONF_UPDATE_MODE,
+    CONF_SCAN_INTERVAL_MINUTES,
+    CONF_DAILY_UPDATE_HOUR,
+    CONF_DAILY_UPDATE_MINUTE,
+    UPDATE_MODE_INTERVAL,
+    UPDATE_MODE_DAILY,
+    DEFAULT_UPDATE_MODE,
+    DEFAULT_SCAN_INTERVAL_MINUTES,
+    DEFAULT_DAILY_UPDATE_HOUR,
+    DEFAULT_DAILY_UPDATE_MINUTE,
+)
 from .api import HomeInfoPointClient
 
 _LOGGER = logging.getLogger(__name__)
@@ -65,6 +81,54 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle the update schedule options for Home.InfoPoint."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self._config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_UPDATE_MODE,
+                        default=options.get(CONF_UPDATE_MODE, DEFAULT_UPDATE_MODE),
+                    ): vol.In([UPDATE_MODE_DAILY, UPDATE_MODE_INTERVAL]),
+                    vol.Required(
+                        CONF_SCAN_INTERVAL_MINUTES,
+                        default=options.get(CONF_SCAN_INTERVAL_MINUTES, DEFAULT_SCAN_INTERVAL_MINUTES),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_DAILY_UPDATE_HOUR,
+                        default=options.get(CONF_DAILY_UPDATE_HOUR, DEFAULT_DAILY_UPDATE_HOUR),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=23)),
+                    vol.Required(
+                        CONF_DAILY_UPDATE_MINUTE,
+                        default=options.get(CONF_DAILY_UPDATE_MINUTE, DEFAULT_DAILY_UPDATE_MINUTE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=59)),
+                }
+            ),
+        )
+
 
 class InvalidAuth(HomeAssistantError):
     """Error to indicate there is invalid auth."""
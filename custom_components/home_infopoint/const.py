@@ -5,3 +5,17 @@ DEFAULT_URL = "https://homeinfopoint.de/czg-jena/"
 CONF_URL = "url"
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
+
+# Options
+CONF_UPDATE_MODE = "update_mode"
+CONF_SCAN_INTERVAL_MINUTES = "scan_interval_minutes"
+CONF_DAILY_UPDATE_HOUR = "daily_update_hour"
+CONF_DAILY_UPDATE_MINUTE = "daily_update_minute"
+# Either poll every scan_interval_minutes or update once a day, never both
+UPDATE_MODE_INTERVAL = "interval"
+UPDATE_MODE_DAILY = "daily"
+DEFAULT_UPDATE_MODE = UPDATE_MODE_DAILY
+# Grades change at most daily, poll every 12 hours in interval mode
+DEFAULT_SCAN_INTERVAL_MINUTES = 720
+DEFAULT_DAILY_UPDATE_HOUR = 17
+DEFAULT_DAILY_UPDATE_MINUTE = 50
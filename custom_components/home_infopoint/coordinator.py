@@ -2,21 +2,39 @@
 from __future__ import annotations
 
 import logging
+import re
 from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_change
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
 from .api import HomeInfoPointClient
-from .const import DOMAIN, CONF_USERNAME, CONF_PASSWORD, CONF_URL
+from .const import (
+    DOMAIN,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    CONF_URL,
+    CONF_UPDATE_MODE,
+    CONF_SCAN_INTERVAL_MINUTES,
+    CONF_DAILY_UPDATE_HOUR,
+    CONF_DAILY_UPDATE_MINUTE,
+    UPDATE_MODE_DAILY,
+    DEFAULT_UPDATE_MODE,
+    DEFAULT_SCAN_INTERVAL_MINUTES,
+    DEFAULT_DAILY_UPDATE_HOUR,
+    DEFAULT_DAILY_UPDATE_MINUTE,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+_GRADE_RE = re.compile(r"^\s*(\d+(?:[.,]\d+)?)")
+
 
 class HomeInfoPointDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Home.InfoPoint data."""
@@ -30,27 +48,35 @@ class HomeInfoPointDataUpdateCoordinator(DataUpdateCoordinator):
             entry.data[CONF_PASSWORD],
             entry.data[CONF_URL],
         )
+        # Subjects that already have a sensor
+        self.known_subjects: set[str] = set()
+
+        daily = entry.options.get(CONF_UPDATE_MODE, DEFAULT_UPDATE_MODE) == UPDATE_MODE_DAILY
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            # Disable automatic polling
-            update_interval=None,
-        )
-        
-        # Schedule daily update at 17:50
-        # Assuming HA is configured with the correct timezone (Berlin)
-        from homeassistant.helpers.event import async_track_time_change
-        
-        self.unsub_schedule = async_track_time_change(
-            hass, 
-            self._async_scheduled_update, 
-            hour=17, 
-            minute=50, 
-            second=0
+            # Disable automatic polling in daily mode, the time trigger below refreshes
+            update_interval=None if daily else timedelta(
+                minutes=entry.options.get(CONF_SCAN_INTERVAL_MINUTES, DEFAULT_SCAN_INTERVAL_MINUTES)
+            ),
         )
 
+        self.unsub_schedule = None
+        if daily:
+            # Schedule daily update (17:50 by default)
+            # Assuming HA is configured with the correct timezone (Berlin)
+            self.unsub_schedule = async_track_time_change(
+                hass, 
+                self._async_scheduled_update, 
+                hour=entry.options.get(CONF_DAILY_UPDATE_HOUR, DEFAULT_DAILY_UPDATE_HOUR), 
+                minute=entry.options.get(CONF_DAILY_UPDATE_MINUTE, DEFAULT_DAILY_UPDATE_MINUTE), 
+                second=0
+            )
+            # Drop the schedule when the entry is unloaded or reloaded with new options
+            entry.async_on_unload(self.unsub_schedule)
+
     async def _async_scheduled_update(self, now):
         """Trigger update from schedule."""
         _LOGGER.debug(f"Triggering scheduled update at {now}")
@@ -59,6 +85,41 @@ class HomeInfoPointDataUpdateCoordinator(DataUpdateCoordinator):
     async def _async_update_data(self):
         """Fetch data from API endpoint."""
         try:
-            return await self.api.get_data()
+            data = await self.api.get_data()
         except Exception as err:
             raise UpdateFailed(f"Error communicating with API: {err}")
+
+        self._index_grades(data)
+        return data
+
+    @staticmethod
+    def _index_grades(data: dict) -> None:
+        """Group grades by subject and precompute the averages once per refresh."""
+        grades_by_subject: dict[str, list] = {}
+        for g in data.get("grades", []):
+            grades_by_subject.setdefault(g["subject"], []).append(g)
+
+        subject_avg: dict[str, float | None] = {}
+        for subject, grades in grades_by_subject.items():
+            total = 0.0
+            count = 0
+            for g in grades:
+                # Handle simple grades like "1", "2", "15", "1,5"
+                # Modifiers like "2-" or "15p" count with their leading number
+                m = _GRADE_RE.match(g["grade"])
+                if m:
+                    total += float(m.group(1).replace(",", "."))
+                    count += 1
+            subject_avg[subject] = round(total / count, 2) if count else None
+
+        data["_grades_by_subject"] = grades_by_subject
+        data["_subject_avg"] = subject_avg
+
+    def get_subject(self, subject: str) -> tuple[list, float | None]:
+        """Return the grades and the average grade for a subject."""
+        if not self.data:
+            return [], None
+        return (
+            self.data.get("_grades_by_subject", {}).get(subject, []),
+            self.data.get("_subject_avg", {}).get(subject),
+        )
@@ -3,9 +3,9 @@ from __future__ import annotations
 
 import logging
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -14,6 +14,47 @@ from .coordinator import HomeInfoPointDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+SENSOR_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="last_update",
+        name="Home.InfoPoint Last Update",
+        icon="mdi:clock-outline",
+    ),
+)
+
+ABSENCE_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="days",
+        name="Home.InfoPoint Absences (Days)",
+        icon="mdi:calendar-remove",
+    ),
+    SensorEntityDescription(
+        key="unexcused_days",
+        name="Home.InfoPoint Unexcused Absences (Days)",
+        icon="mdi:calendar-alert",
+    ),
+    SensorEntityDescription(
+        key="hours",
+        name="Home.InfoPoint Absences (Hours)",
+        icon="mdi:clock-remove",
+    ),
+)
+
+# Subject descriptions are shared by all entries and survive reloads
+_SUBJECT_DESCRIPTIONS: dict[str, SensorEntityDescription] = {}
+
+
+def _subject_description(subject: str) -> SensorEntityDescription:
+    """Return the (cached) description for a subject sensor."""
+    description = _SUBJECT_DESCRIPTIONS.get(subject)
+    if description is None:
+        description = _SUBJECT_DESCRIPTIONS[subject] = SensorEntityDescription(
+            key="subject_" + subject.replace(" ", "_"),
+            name="Home.InfoPoint " + subject,
+            icon="mdi:book-open-variant",
+        )
+    return description
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -29,27 +70,33 @@ async def async_setup_entry(
     entities = []
     
     # Static Sensor: Last Update
-    entities.append(HomeInfoPointSensor(coordinator, "last_update", "Last Update", "mdi:clock-outline"))
+    entities.extend(HomeInfoPointSensor(coordinator, description) for description in SENSOR_DESCRIPTIONS)
     
     # Static Sensors: Absences
-    entities.append(HomeInfoPointAbsenceSensor(coordinator, "days", "Absences (Days)", "mdi:calendar-remove"))
-    entities.append(HomeInfoPointAbsenceSensor(coordinator, "unexcused_days", "Unexcused Absences (Days)", "mdi:calendar-alert"))
-    entities.append(HomeInfoPointAbsenceSensor(coordinator, "hours", "Absences (Hours)", "mdi:clock-remove"))
+    entities.extend(HomeInfoPointAbsenceSensor(coordinator, description) for description in ABSENCE_DESCRIPTIONS)
     
     # Dynamic Sensors: Subjects
-    # We will create a sensor for each subject found in the grades
-    # To handle dynamic addition, we might need to check this on each update, 
-    # but for now we create them at setup if data exists, or on next reload.
-    # Note: Adding entities dynamically after setup requires a bit more logic or a reload.
-    # For now, we add what we see.
-    
-    if coordinator.data and "grades" in coordinator.data:
-        subjects = set(g["subject"] for g in coordinator.data["grades"])
-        for subject in subjects:
-            entities.append(HomeInfoPointSubjectSensor(coordinator, subject))
+    # We create a sensor for each subject found in the grades, and add sensors
+    # for subjects that show up in later refreshes without a reload.
+    def _new_subject_sensors() -> list[HomeInfoPointSubjectSensor]:
+        """Return sensors for subjects that have no sensor yet."""
+        if not coordinator.data:
+            return []
+        new_subjects = coordinator.data.get("_grades_by_subject", {}).keys() - coordinator.known_subjects
+        coordinator.known_subjects |= new_subjects
+        return [HomeInfoPointSubjectSensor(coordinator, subject) for subject in new_subjects]
+
+    @callback
+    def _async_add_new_subjects() -> None:
+        """Add sensors for subjects that appeared in the last refresh."""
+        if new_entities := _new_subject_sensors():
+            async_add_entities(new_entities)
 
+    entities.extend(_new_subject_sensors())
     async_add_entities(entities)
 
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_new_subjects))
+
 
 class HomeInfoPointSensor(CoordinatorEntity, SensorEntity):
     """Representation of a generic Home.InfoPoint Sensor."""
@@ -57,37 +104,31 @@ class HomeInfoPointSensor(CoordinatorEntity, SensorEntity):
     def __init__(
         self,
         coordinator: HomeInfoPointDataUpdateCoordinator,
-        key: str,
-        name: str,
-        icon: str = "mdi:school"
+        description: SensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._key = key
-        self._attr_name = f"Home.InfoPoint {name}"
-        self._attr_unique_id = f"{coordinator.entry.entry_id}_{key}"
-        self._attr_icon = icon
+        self.entity_description = description
+        self._attr_unique_id = coordinator.entry.entry_id + "_" + description.key
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self.coordinator.data.get(self._key)
+        return self.coordinator.data.get(self.entity_description.key)
 
 class HomeInfoPointAbsenceSensor(CoordinatorEntity, SensorEntity):
     """Sensor for Absences."""
     
-    def __init__(self, coordinator, key, name, icon):
+    def __init__(self, coordinator, description):
         super().__init__(coordinator)
-        self._key = key
-        self._attr_name = f"Home.InfoPoint {name}"
-        self._attr_unique_id = f"{coordinator.entry.entry_id}_absence_{key}"
-        self._attr_icon = icon
+        self.entity_description = description
+        self._attr_unique_id = coordinator.entry.entry_id + "_absence_" + description.key
     
     @property
     def native_value(self):
         if not self.coordinator.data or "absences" not in self.coordinator.data:
             return None
-        return self.coordinator.data["absences"].get(self._key)
+        return self.coordinator.data["absences"].get(self.entity_description.key)
 
 class HomeInfoPointSubjectSensor(CoordinatorEntity, SensorEntity):
     """Sensor for a specific Subject (showing latest grade)."""
@@ -95,51 +136,19 @@ class HomeInfoPointSubjectSensor(CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator, subject):
         super().__init__(coordinator)
         self._subject = subject
-        self._attr_name = f"Home.InfoPoint {subject}"
-        self._attr_unique_id = f"{coordinator.entry.entry_id}_subject_{subject.replace(' ', '_')}"
-        self._attr_icon = "mdi:book-open-variant"
+        self.entity_description = _subject_description(subject)
+        self._attr_unique_id = coordinator.entry.entry_id + "_" + self.entity_description.key
     
     @property
     def native_value(self):
         """Return the average grade for this subject."""
-        if not self.coordinator.data or "grades" not in self.coordinator.data:
-            return None
-            
-        grades = [g for g in self.coordinator.data["grades"] if g["subject"] == self._subject]
-        if not grades:
-            return None
-            
-        # Calculate Average
-        total = 0.0
-        count = 0
-        for g in grades:
-            try:
-                # Handle simple grades like "1", "2", "15"
-                # If there are modifiers like "+", "-", "2-", handle them if possible or ignore
-                # German grades: 1+ = 0.75? Notensystem 1-15 points? 
-                # The user dump showed "2", "4", "5", "1". 
-                # Let's try simple float conversion first.
-                val_str = g["grade"].replace(",", ".").strip()
-                # Remove common non-numeric suffixes if attached directly, though risky.
-                # Use a helper or just strict float
-                val = float(val_str)
-                total += val
-                count += 1
-            except ValueError:
-                pass
-        
-        if count == 0:
-            return None
-            
-        return round(total / count, 2)
+        _, average = self.coordinator.get_subject(self._subject)
+        return average
 
     @property
     def extra_state_attributes(self):
         """Return details about the grade and history."""
-        if not self.coordinator.data or "grades" not in self.coordinator.data:
-            return {}
-            
-        grades = [g for g in self.coordinator.data["grades"] if g["subject"] == self._subject]
+        grades, _ = self.coordinator.get_subject(self._subject)
         if not grades:
             return {}
             